@@ -1,42 +1,123 @@
 import typing
 import enum
+import io
 import struct
 import json
+import math
+import weakref
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_U8          = struct.Struct("<B")
+_U32         = struct.Struct("<I")
+_LONG_STRING = struct.Struct("<BBI")
+_HEADER      = struct.Struct("<BB")
+_BOOL_NODE   = struct.Struct("<BB?")
+_NUMBER_NODE = struct.Struct("<BBd")
+_LIST_NODE   = struct.Struct("<BBI")
+_VER         = struct.Struct("<HHHH")
+
+# Encoded string headers, precomputed for `None` and (indexed by length) all but the longest strings.
+_NONE_STRING_HEADER   = b"\x01"
+_SHORT_STRING_HEADERS = tuple(bytes((0, length)) for length in range(0xff))
+
+# Returned by `next()` once the items of a list or dictionary run out. Not `None`, since an item
+# that is (incorrectly) `None` must fail when it is used rather than end the list early.
+_END = object()
+
+
+def _load_from_stream(load_from, stream: typing.BinaryIO):
+    # The whole rest of the stream is read at once, and if the stream is seekable, it is then
+    # rewound to just past the parsed object, so that whatever follows it can still be read.
+    # If the stream isn't seekable, the data that follows the parsed object is lost.
+    buf = stream.read()
+    value, offset = load_from(buf, 0)
+    if offset < len(buf) and stream.seekable():
+        stream.seek(offset - len(buf), io.SEEK_CUR)
+    return value
 
 
 class ImmutableString:
-    value: typing.Union[None, bytes]
+    __slots__ = ("_value", "_decoded", "__weakref__")
 
-    def __init__(self, value: typing.Union[None, bytes]):
-        self.value = value
+    _interned: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+    def __init__(self, value: typing.Union[None, bytes], decoded: typing.Union[None, str] = None):
+        # `decoded`, if provided, must be `value.decode()`; it saves decoding `value` later.
+        self._value = value
+        self._decoded = decoded
+
+    @property
+    def value(self) -> typing.Union[None, bytes]:
+        # Read-only, since interned instances are shared between every tree that uses them.
+        return self._value
+
+    @classmethod
+    def intern(cls, value: typing.Union[None, bytes], decoded: typing.Union[None, str] = None):
+        # Settings files repeat the same few keys (`value`, mod names, ...) a lot. Interning them
+        # shares the storage, and makes comparing them an identity check in the common case.
+        string = cls._interned.get(value)
+        if string is None:
+            string = cls._interned[value] = cls(value, decoded)
+        elif string._decoded is None:
+            string._decoded = decoded
+        return string
 
     @classmethod
     def load(cls, stream: typing.BinaryIO):
-        is_none, = struct.unpack("<B", stream.read(1))
+        return _load_from_stream(cls._load_from, stream)
+
+    @classmethod
+    def _load_from(cls, buf: bytes, offset: int):
+        is_none = buf[offset]
+        offset += 1
 
         if is_none:
-            return cls(None)
+            return cls.intern(None), offset
 
         else:
-            value_len, = struct.unpack("<B", stream.read(1))
+            value_len = buf[offset]
+            offset += 1
             if value_len == 0xff:
-                value_len, = struct.unpack("<I", stream.read(4))
+                value_len, = _U32.unpack_from(buf, offset)
+                offset += 4
 
-            return cls(stream.read(value_len))
+            return cls.intern(bytes(buf[offset:offset + value_len])), offset + value_len
 
     def save(self, stream: typing.BinaryIO):
-        stream.write(struct.pack("<B", self.value is None))
+        buf = bytearray()
+        self._save_into(buf)
+        stream.write(buf)
 
-        if self.value is not None:
-            if len(self.value) >= 0xff:
-                stream.write(struct.pack("<BI", 0xff, len(self.value)))
+    def _save_into(self, buf: bytearray):
+        value = self._value
+        if value is None:
+            buf += _NONE_STRING_HEADER
+
+        else:
+            if len(value) >= 0xff:
+                buf += _LONG_STRING.pack(0, 0xff, len(value))
             else:
-                stream.write(struct.pack("<B", len(self.value)))
+                buf += _SHORT_STRING_HEADERS[len(value)]
 
-            stream.write(self.value)
+            buf += value
+
+    def decode(self) -> typing.Union[None, str]:
+        # Cached, since interned strings (dictionary keys, in particular) are typically decoded
+        # many times when converting a tree to JSON.
+        if self._decoded is None and self._value is not None:
+            self._decoded = self._value.decode()
+        return self._decoded
 
     def __eq__(self, other):
-        return self.value == other.value
+        return self is other or self._value == other.value
+
+    def __hash__(self):
+        return hash(self._value)
 
     def __repr__(self):
         return f"ImmutableString({self.value!r})"
@@ -51,6 +132,11 @@ class PropertyTree:
         List        = 4
         Dictionary  = 5
 
+    # Indexed by the raw type byte; much cheaper than calling `Type(value_type_raw)`.
+    _TYPES = tuple(Type)
+
+    __slots__ = ("key", "value", "type", "any_type")
+
     key: ImmutableString
     value: typing.Union[None, bool, float, ImmutableString, list]
     type: Type
@@ -63,7 +149,7 @@ class PropertyTree:
             any_type: bool = False
     ):
         if key is None:
-            key = ImmutableString(None)
+            key = ImmutableString.intern(None)
 
         self.key = key
         self.value = value
@@ -72,65 +158,216 @@ class PropertyTree:
 
     @classmethod
     def load(cls, stream: typing.BinaryIO):
-        value_type_raw, any_type, = struct.unpack("<BB", stream.read(2))
-        value_type = cls.Type(value_type_raw)
+        return _load_from_stream(cls._load_from, stream)
 
-        if value_type == cls.Type.Null:
-            value = None
-
-        if value_type == cls.Type.Bool:
-            value, = struct.unpack("<B", stream.read(1))
-            value = bool(value)
-
-        if value_type == cls.Type.Number:
-            value, = struct.unpack("<d", stream.read(8))
-
-        if value_type == cls.Type.String:
-            value = ImmutableString.load(stream)
+    @classmethod
+    def _load_from(cls, buf: bytes, offset: int):
+        # Nested lists and dictionaries are parsed using an explicit stack rather than recursion,
+        # so that the nesting depth of the input is not limited by the Python stack depth.
+        #
+        # This loop runs once per node, so everything it looks up repeatedly is bound to a local.
+        # Once the type of a node is known, its header and fixed-size payload are decoded together
+        # with a single `unpack_from` call.
+        types, load_string = cls._TYPES, ImmutableString._load_from
+        unpack_header, unpack_bool, unpack_number, unpack_list = \
+            _HEADER.unpack_from, _BOOL_NODE.unpack_from, _NUMBER_NODE.unpack_from, _LIST_NODE.unpack_from
+        Null, Bool, Number, String, List, Dictionary = types
+
+        stack = []
+        items, remaining = None, 0
+        key = None
+        while True:
+            value_type_raw = buf[offset]
+            try:
+                value_type = types[value_type_raw]
+            except IndexError:
+                raise ValueError(f"{value_type_raw} is not a valid {cls.Type.__qualname__}") from None
+
+            if value_type is Null:
+                _, any_type = unpack_header(buf, offset)
+                value = None
+                offset += 2
+
+            elif value_type is Bool:
+                _, any_type, value = unpack_bool(buf, offset)
+                offset += 3
+
+            elif value_type is Number:
+                _, any_type, value = unpack_number(buf, offset)
+                offset += 10
+
+            elif value_type is String:
+                _, any_type = unpack_header(buf, offset)
+                value, offset = load_string(buf, offset + 2)
+
+            else: # List or Dictionary
+                _, any_type, count = unpack_list(buf, offset)
+                value = []
+                offset += 6
+
+            item = cls(key, value, value_type, bool(any_type))
+            if items is None:
+                root = item
+            else:
+                items.append(item)
 
-        if value_type in (cls.Type.List, cls.Type.Dictionary):
-            count, = struct.unpack("<I", stream.read(4))
-            value = []
+            if value_type is List or value_type is Dictionary:
+                stack.append((items, remaining))
+                items, remaining = value, count
 
-            for _ in range(count):
-                key = ImmutableString.load(stream)
-                item = cls.load(stream)
-                item.key = key
-                value.append(item)
+            while remaining == 0:
+                if not stack:
+                    return root, offset
+                items, remaining = stack.pop()
 
-        return cls(None, value, value_type, bool(any_type))
+            key, offset = load_string(buf, offset)
+            remaining -= 1
 
     def save(self, stream: typing.BinaryIO):
-        stream.write(struct.pack("<BB", self.type.value, self.any_type))
-
-        if self.type == self.Type.Null:
-            pass
-
-        if self.type == self.Type.Bool:
-            stream.write(struct.pack("<B", self.value))
-
-        if self.type == self.Type.Number:
-            stream.write(struct.pack("<d", self.value))
-
-        if self.type == self.Type.String:
-            self.value.save(stream)
+        buf = bytearray()
+        self._save_into(buf)
+        stream.write(buf)
+
+    def _save_into(self, buf: bytearray):
+        # See `_load_from` for why this isn't recursive, and why it binds so many locals.
+        # Like there, the header and fixed-size payload of a node are encoded together.
+        pack_header, pack_bool, pack_number, pack_list = \
+            _HEADER.pack, _BOOL_NODE.pack, _NUMBER_NODE.pack, _LIST_NODE.pack
+        Null, Bool, Number, String, List, Dictionary = self._TYPES
+        # `Type.value` is a property, so the raw type bytes are looked up in advance as well.
+        NULL, BOOL, NUMBER, STRING, LIST, DICTIONARY = (value_type.value for value_type in self._TYPES)
+
+        stack = []
+        item = self
+        while True:
+            item_type = item.type
+            if item_type is Null:
+                buf += pack_header(NULL, item.any_type)
+
+            elif item_type is Bool:
+                buf += pack_bool(BOOL, item.any_type, item.value)
+
+            elif item_type is Number:
+                buf += pack_number(NUMBER, item.any_type, item.value)
+
+            elif item_type is String:
+                buf += pack_header(STRING, item.any_type)
+                item.value._save_into(buf)
+
+            else: # List or Dictionary
+                buf += pack_list(LIST if item_type is List else DICTIONARY, item.any_type, len(item.value))
+                stack.append(iter(item.value))
+
+            while stack:
+                item = next(stack[-1], _END)
+                if item is not _END:
+                    break
+                stack.pop()
+            else:
+                return
+
+            item.key._save_into(buf)
+
+    def to_json_bytes(self, indent: int = 2) -> bytes:
+        # Equivalent to `json.dumps(self, indent=indent, cls=JSONEncoder).encode()`, but writes
+        # the JSON text directly instead of building a dict or list for every node first.
+        # One difference: if a dictionary has several items with the same key, all of them are
+        # written, where `JSONEncoder` would only keep the last one.
+        chunks = []
+        self._to_json_into(chunks, indent, 0)
+        return "".join(chunks).encode("ascii")
+
+    def _to_json_into(self, chunks: list, indent: int, depth: int):
+        # See `_load_from` for why this isn't recursive.
+        encode_string = json.encoder.encode_basestring_ascii
+        Null, Bool, Number, String, List, Dictionary = self._TYPES
+
+        stack = []
+        first = True
+        item = self
+        while True:
+            item_type = item.type
+            if item_type is Null:
+                chunks.append("null")
+
+            elif item_type is Bool:
+                chunks.append("true" if item.value else "false")
+
+            elif item_type is Number:
+                chunks.append(_json_number(item.value))
+
+            elif item_type is String:
+                value = item.value.decode()
+                chunks.append("null" if value is None else encode_string(value))
+
+            else: # List or Dictionary
+                is_dict = item_type is Dictionary
+                if not item.value:
+                    chunks.append("{}" if is_dict else "[]")
+                else:
+                    chunks.append("{" if is_dict else "[")
+                    newline = "\n" + " " * (indent * (depth + len(stack) + 1))
+                    stack.append((iter(item.value), is_dict, newline))
+                    first = True
+
+            while stack:
+                items, is_dict, newline = stack[-1]
+                item = next(items, _END)
+                if item is _END:
+                    stack.pop()
+                    chunks.append(newline[:len(newline) - indent] + ("}" if is_dict else "]"))
+                    continue
+
+                chunks.append(newline if first else "," + newline)
+                first = False
+                if is_dict:
+                    key = item.key.decode()
+                    chunks.append(encode_string("null" if key is None else key))
+                    chunks.append(": ")
+                if isinstance(item, PropertyTree):
+                    break
+
+                # Lists built by `JSONDecoder` may contain plain values (e.g. `None`) as items.
+                # JSON strings never contain a literal newline, so this only re-indents the lines.
+                chunks.append(json.dumps(item, indent=indent, cls=JSONEncoder).replace("\n", newline))
+            else:
+                return
 
-        if self.type in (self.Type.List, self.Type.Dictionary):
-            stream.write(struct.pack("<I", len(self.value)))
+    def __eq__(self, other):
+        # Trees are compared using an explicit stack for the same reason as in `_load_from`.
+        List, Dictionary = self.Type.List, self.Type.Dictionary
+
+        stack = [(self, other)]
+        while stack:
+            left, right = stack.pop()
+            if left is right:
+                continue
+
+            # Strings are usually interned, so checking identity first avoids calling `__eq__`.
+            left_type, left_key, right_key = left.type, left.key, right.key
+            if not ((left_key is right_key or left_key == right_key) and
+                    left_type is right.type and left.any_type == right.any_type):
+                return False
+
+            if left_type is List or left_type is Dictionary:
+                if len(left.value) != len(right.value):
+                    return False
+                stack.extend(zip(left.value, right.value))
 
-            for item in self.value:
-                item.key.save(stream)
-                item.save(stream)
+            else:
+                left_value, right_value = left.value, right.value
+                if not (left_value is right_value or left_value == right_value):
+                    return False
 
-    def __eq__(self, other):
-        return (self.key == other.key and self.value == other.value and
-                self.type == other.type and self.any_type == other.any_type)
+        return True
 
     def __repr__(self):
         return f"PropertyTree({self.key.value!r}, {self.value!r}, {self.type!r}, anyType={self.any_type!r})"
 
 
 class ModSettings:
+    __slots__ = ("data", "version", "has_quality")
+
     data: PropertyTree
     version: typing.Tuple[int, int, int, int]
     has_quality: bool
@@ -142,20 +379,44 @@ class ModSettings:
 
     @classmethod
     def load(cls, stream: typing.BinaryIO):
-        # Factorio 1.1.110 becomes (1, 1, 110, 0)
-        version = struct.unpack("<HHHH", stream.read(8))
-        has_quality, = struct.unpack("<B", stream.read(1))
-        data = PropertyTree.load(stream)
+        value, _ = cls._load_from(stream.read(), 0)
+        return value
 
+    @classmethod
+    def _load_from(cls, buf: bytes, offset: int):
+        # Factorio 1.1.110 becomes (1, 1, 110, 0)
+        version = _VER.unpack_from(buf, offset)
         if version < (0, 18, 0, 0):
             raise Exception(f"Cannot load settings from Factorio {version!r}: settings version too low")
 
-        return cls(data, version, bool(has_quality))
+        has_quality = buf[offset + 8]
+        data, offset = PropertyTree._load_from(buf, offset + 9)
+
+        return cls(data, version, bool(has_quality)), offset
 
     def save(self, stream: typing.BinaryIO):
-        stream.write(struct.pack("<HHHH", *self.version))
-        stream.write(struct.pack("<B", self.has_quality))
-        self.data.save(stream)
+        buf = bytearray()
+        self._save_into(buf)
+        stream.write(buf)
+
+    def _save_into(self, buf: bytearray):
+        buf += _VER.pack(*self.version)
+        buf += _U8.pack(self.has_quality)
+        self.data._save_into(buf)
+
+    def to_json_bytes(self, indent: int = 2) -> bytes:
+        # See `PropertyTree.to_json_bytes`.
+        newline = "\n" + " " * indent
+        version = ("," + newline + " " * indent).join(str(part) for part in self.version)
+        chunks = [
+            "{", newline, '"!type": "ModSettings",',
+            newline, '"version": [', newline, " " * indent, version, newline, "],",
+            newline, '"has_quality": ', "true" if self.has_quality else "false", ",",
+            newline, '"data": '
+        ]
+        self.data._to_json_into(chunks, indent, 1)
+        chunks.append("\n}")
+        return "".join(chunks).encode("ascii")
 
     def __eq__(self, other):
         return self.data == other.data and self.version == other.version and self.has_quality == other.has_quality
@@ -164,91 +425,192 @@ class ModSettings:
         return f"ModSettings({self.data!r}, version={self.version!r}, has_quality={self.has_quality!r})"
 
 
-class JSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, ImmutableString):
-            if obj.value is None:
-                return None
-            else:
-                return obj.value.decode()
+def _json_number(value: float) -> str:
+    # Same as `json`; JSON has no way to represent NaN or infinity.
+    if value != value:
+        return "NaN"
+    elif value == math.inf:
+        return "Infinity"
+    elif value == -math.inf:
+        return "-Infinity"
+    else:
+        return repr(value)
+
+
+def _json_default_string(obj: ImmutableString):
+    return obj.decode()
+
+
+def _json_default_tree(obj: PropertyTree):
+    obj_type = obj.type
+    if obj_type is PropertyTree.Type.Null:
+        return None
 
-        if isinstance(obj, PropertyTree):
-            if obj.type == PropertyTree.Type.Null:
-                return None
+    elif obj_type is PropertyTree.Type.Bool:
+        return obj.value
 
-            if obj.type == PropertyTree.Type.Bool:
-                return obj.value
+    elif obj_type is PropertyTree.Type.Number:
+        return obj.value # this might not round-trip if it gets rounded
 
-            if obj.type == PropertyTree.Type.Number:
-                return obj.value # this might not round-trip if it gets rounded
+    elif obj_type is PropertyTree.Type.String:
+        return obj.value
 
-            if obj.type == PropertyTree.Type.String:
-                return obj.value
+    elif obj_type is PropertyTree.Type.List:
+        return [item for item in obj.value]
 
-            if obj.type == PropertyTree.Type.List:
-                return [item for item in obj.value]
+    elif obj_type is PropertyTree.Type.Dictionary:
+        return {item.key.decode(): item for item in obj.value}
 
-            if obj.type == PropertyTree.Type.Dictionary:
-                return {item.key.value.decode(): item for item in obj.value}
 
-        if isinstance(obj, ModSettings):
-            return {
-                "!type": "ModSettings",
-                "version": obj.version,
-                "has_quality": obj.has_quality,
-                "data": obj.data
-            }
+def _json_default_settings(obj: ModSettings):
+    return {
+        "!type": "ModSettings",
+        "version": obj.version,
+        "has_quality": obj.has_quality,
+        "data": obj.data
+    }
 
-        return super().default(obj)
+
+# Keyed by the exact type of the object, since a dict lookup is cheaper than a chain of
+# `isinstance` checks, and `default` is called once for every node in the tree.
+_JSON_DEFAULTS = {
+    ImmutableString:    _json_default_string,
+    PropertyTree:       _json_default_tree,
+    ModSettings:        _json_default_settings,
+}
+
+
+class JSONEncoder(json.JSONEncoder):
+    def default(self, obj):
+        default = _JSON_DEFAULTS.get(type(obj))
+        if default is None:
+            return super().default(obj)
+        return default(obj)
 
 
 class JSONDecoder(json.JSONDecoder):
     def __init__(self, strict=True):
         super().__init__(object_hook=self.object_hook, strict=strict)
+        # Like `_JSON_DEFAULTS`; keying by exact type also keeps `bool` apart from `int`.
+        self._handlers = {
+            type(None):     self._from_none,
+            bool:           self._from_bool,
+            int:            self._from_int,
+            float:          self._from_float,
+            str:            self._from_str,
+            list:           self._from_list,
+            dict:           self._from_dict,
+            PropertyTree:   self._from_tree,
+        }
+        # Dictionary keys repeat a lot; each distinct one is only encoded and interned once.
+        self._strings = {}
 
     def object_hook(self, obj):
-        if obj is None:
-            return PropertyTree(None, None, PropertyTree.Type.Null)
+        handler = self._handlers.get(type(obj))
+        if handler is None:
+            raise NotImplementedError(f"Cannot convert {obj!r}")
+        return handler(obj)
 
-        if isinstance(obj, bool):
-            return PropertyTree(None, obj, PropertyTree.Type.Bool)
+    def _from_none(self, obj):
+        return PropertyTree(None, None, PropertyTree.Type.Null)
 
-        if isinstance(obj, float):
-            return PropertyTree(None, obj, PropertyTree.Type.Number)
+    def _from_bool(self, obj):
+        return PropertyTree(None, obj, PropertyTree.Type.Bool)
 
-        if isinstance(obj, str):
-            return PropertyTree(None, ImmutableString(obj.encode()), PropertyTree.Type.String)
+    def _from_int(self, obj):
+        # All numbers are doubles; this happens if a number is written without a decimal point.
+        return PropertyTree(None, float(obj), PropertyTree.Type.Number)
 
-        if isinstance(obj, list):
-            return PropertyTree(None, obj, PropertyTree.Type.List)
+    def _from_float(self, obj):
+        return PropertyTree(None, obj, PropertyTree.Type.Number)
 
-        if isinstance(obj, dict):
-            if "!type" in obj:
-                if obj["!type"] == "ModSettings":
-                    return ModSettings(obj["data"], (*obj["version"],), obj["has_quality"])
-                else:
-                    raise Exception(f"Unknown object type {obj['!type']}")
+    def _from_str(self, obj):
+        return PropertyTree(None, self._intern(obj), PropertyTree.Type.String)
 
+    def _from_list(self, obj):
+        return PropertyTree(None, obj, PropertyTree.Type.List)
+
+    def _from_dict(self, obj):
+        if "!type" in obj:
+            if obj["!type"] == "ModSettings":
+                return ModSettings(obj["data"], (*obj["version"],), obj["has_quality"])
             else:
-                items = []
-                for key, value in obj.items():
-                    item = self.object_hook(value)
-                    item.key = ImmutableString(key.encode())
-                    items.append(item)
+                raise Exception(f"Unknown object type {obj['!type']}")
 
-                return PropertyTree(None, items, PropertyTree.Type.Dictionary)
+        else:
+            items = []
+            for key, value in obj.items():
+                item = self.object_hook(value)
+                item.key = self._intern(key)
+                items.append(item)
+
+            return PropertyTree(None, items, PropertyTree.Type.Dictionary)
+
+    def _from_tree(self, obj):
+        return obj
+
+    def _intern(self, value: str):
+        string = self._strings.get(value)
+        if string is None:
+            string = self._strings[value] = ImmutableString.intern(value.encode(), value)
+        return string
+
+
+def _json_loads(data: bytes):
+    if orjson is not None:
+        try:
+            plain = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass # possibly NaN or infinity, which only `json` accepts
+        else:
+            return _json_from_plain(plain, JSONDecoder().object_hook)
+
+    return json.loads(data, cls=JSONDecoder)
 
-        if isinstance(obj, PropertyTree):
-            return obj
 
-        raise NotImplementedError(f"Cannot convert {obj!r}")
+def _json_from_plain(obj, object_hook):
+    # Applies `object_hook` to each dictionary after its values, like `json.loads` does.
+    # See `PropertyTree._load_from` for why this isn't recursive.
+    if type(obj) is dict:
+        stack = [(True, iter(obj.items()), {}, None)]
+    elif type(obj) is list:
+        stack = [(False, iter(obj), [], None)]
+    else:
+        return obj
+
+    while True:
+        is_dict, items, result, result_key = stack[-1]
+        for entry in items:
+            key, value = entry if is_dict else (None, entry)
+            if type(value) is dict:
+                stack.append((True, iter(value.items()), {}, key))
+                break
+            elif type(value) is list:
+                stack.append((False, iter(value), [], key))
+                break
+            elif is_dict:
+                result[key] = value
+            else:
+                result.append(value)
+
+        else:
+            stack.pop()
+            value = object_hook(result) if is_dict else result
+            if not stack:
+                return value
+
+            parent_is_dict, _, parent, _ = stack[-1]
+            if parent_is_dict:
+                parent[result_key] = value
+            else:
+                parent.append(value)
 
 
 def selftest():
     with open("example-mod-settings.dat", "rb") as selftest_dat:
         settings_1 = ModSettings.load(selftest_dat)
-    json_data = json.dumps(settings_1, indent=2, cls=JSONEncoder)
-    settings_2 = json.loads(json_data, cls=JSONDecoder)
+    json_data = settings_1.to_json_bytes()
+    settings_2 = _json_loads(json_data)
     with open("roundtrip-mod-settings.dat", "wb") as roundtrip_dat:
         settings_2.save(roundtrip_dat)
 
@@ -259,7 +621,6 @@ def selftest():
 def main():
     import sys
     import argparse
-    import io
 
     parser = argparse.ArgumentParser(description="""
     Converts Factorio settings in `mod-settings.dat` to JSON and back.
@@ -278,7 +639,7 @@ def main():
 
     elif args.input.name.endswith(".json"):
         print(f"Reading JSON file '{args.input.name}'...", file=sys.stderr)
-        mod_settings = json.load(args.input, cls=JSONDecoder)
+        mod_settings = _json_loads(args.input.read())
         default_output_name = args.input.name[:-5] + ".dat"
 
     else:
@@ -295,8 +656,7 @@ def main():
 
     elif output.name.endswith(".json"):
         print(f"Writing JSON file '{output.name}'...", file=sys.stderr)
-        text_output = io.TextIOWrapper(output, encoding="utf-8")
-        json.dump(mod_settings, text_output, indent=4, cls=JSONEncoder)
+        output.write(mod_settings.to_json_bytes(indent=4))
 
     else:
         print(f"Output filename '{output.name}' does not end with .dat or .json.", file=sys.stderr)